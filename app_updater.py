@@ -13,15 +13,22 @@ import os
 import sys
 import shutil
 import subprocess
-from packaging import version
-from version import __version__, GITHUB_API_URL, DOWNLOAD_URL_TEMPLATE
+from version import __version__, DOWNLOAD_URL_TEMPLATE, METADATA_MIRRORS, ASSET_MIRROR_TEMPLATES
+from version import UPDATE_CHANNEL, UPDATE_PIN, SKIPPED_VERSIONS
+from update_cache import UpdateCache
+import mirrors
+import release_index
 
 
 class AppUpdater:
-    def __init__(self, parent_window=None):
+    def __init__(self, parent_window=None, cache=None):
         self.parent_window = parent_window
+        # Shared with this user's other instances so only one downloads;
+        # created by the first check so a bad cache dir is reported there
+        self.cache = cache
         self.current_version = __version__
         self.app_path = self._get_app_path()
+        self._progress_window = None
     
     def _get_app_path(self):
         """Get the path to the current .app bundle"""
@@ -32,25 +39,46 @@ class AppUpdater:
             # Running as script
             return os.path.dirname(os.path.abspath(__file__))
     
+    def _fetch_latest_release(self):
+        """Fetch the latest release from the fastest mirror, returns (status_code, release_data)"""
+        return mirrors.fetch_json(METADATA_MIRRORS, timeout=10)
+    
+    def _fetch_release_page(self, page, etag=None):
+        """Fetch one page of the releases list, returns (status_code, releases, etag)"""
+        return release_index.fetch_release_page(page, etag)
+    
+    def _find_update(self):
+        """Best release to offer on the configured channel, or None if up to date"""
+        index = release_index.ReleaseIndex(self.cache, self._fetch_release_page)
+        index.sync()
+        return index.best_update(self.current_version, UPDATE_CHANNEL, SKIPPED_VERSIONS, UPDATE_PIN)
+    
     def check_for_updates(self, show_no_update_message=False):
         """Check for updates in a background thread"""
         def _check():
             try:
-                response = requests.get(GITHUB_API_URL, timeout=10)
-                if response.status_code == 200:
-                    release_data = response.json()
-                    latest_version = release_data['tag_name'].lstrip('v')
-                    
-                    if version.parse(latest_version) > version.parse(self.current_version):
-                        self._show_update_dialog(latest_version, release_data)
-                    elif show_no_update_message:
-                        self._show_no_update_message()
-                else:
-                    if show_no_update_message:
-                        error_msg = f"Failed to check for updates (HTTP {response.status_code})"
-                        if response.status_code == 404:
-                            error_msg += "\n\nThis usually means:\n• No releases exist yet\n• Repository is private\n• Repository doesn't exist"
-                        self._show_error_message(error_msg)
+                if self.cache is None:
+                    self.cache = UpdateCache()
+                try:
+                    release_data = self._find_update()
+                except requests.RequestException:
+                    # Releases list unreachable, fall back to the latest release
+                    status_code, release_data = self.cache.get_release(self._fetch_latest_release)
+                    if status_code != 200:
+                        if show_no_update_message:
+                            error_msg = f"Failed to check for updates (HTTP {status_code})"
+                            if status_code == 404:
+                                error_msg += "\n\nThis usually means:\n• No releases exist yet\n• Repository is private\n• Repository doesn't exist"
+                            self._show_error_message(error_msg)
+                        return
+                    if not release_index.offers(release_data, self.current_version,
+                                                UPDATE_CHANNEL, SKIPPED_VERSIONS, UPDATE_PIN):
+                        release_data = None
+                
+                if release_data is not None:
+                    self._show_update_dialog(release_data['tag_name'].lstrip('v'), release_data)
+                elif show_no_update_message:
+                    self._show_no_update_message()
             except Exception as e:
                 if show_no_update_message:
                     self._show_error_message(f"Update check failed: {str(e)}")
@@ -89,9 +117,19 @@ Would you like to download and install the update?"""
             try:
                 # Find the DMG download URL
                 download_url = None
+                download_urls = []
+                expected_sha256 = None
                 for asset in release_data.get('assets', []):
                     if asset['name'].endswith('.dmg'):
                         download_url = asset['browser_download_url']
+                        download_urls = [download_url] + [
+                            template.format(tag=release_data['tag_name'], name=asset['name'])
+                            for template in ASSET_MIRROR_TEMPLATES
+                        ]
+                        # GitHub publishes digests as "sha256:<hex>"
+                        digest = asset.get('digest') or ''
+                        if digest.startswith('sha256:'):
+                            expected_sha256 = digest[len('sha256:'):]
                         break
                 
                 if not download_url:
@@ -101,14 +139,15 @@ Would you like to download and install the update?"""
                 # Show download progress
                 self._show_download_progress()
                 
-                # Download the DMG
-                response = requests.get(download_url, stream=True)
-                response.raise_for_status()
-                
-                dmg_path = f"/tmp/Beautiful-Flower-Display-{latest_version}.dmg"
-                with open(dmg_path, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        f.write(chunk)
+                # Download the DMG, or reuse one another instance already fetched
+                try:
+                    dmg_path = self.cache.get_artifact(
+                        download_url,
+                        lambda path: self._download_file(download_urls, path, expected_sha256),
+                        expected_sha256
+                    )
+                finally:
+                    self._close_download_progress()
                 
                 # Install the update
                 self._install_update(dmg_path, latest_version)
@@ -120,10 +159,15 @@ Would you like to download and install the update?"""
         thread = threading.Thread(target=_download, daemon=True)
         thread.start()
     
+    def _download_file(self, download_urls, dmg_path, expected_sha256=None):
+        """Stream a release asset to disk from the fastest of its mirrors"""
+        mirrors.download(download_urls, dmg_path, expected_sha256)
+    
     def _show_download_progress(self):
         """Show download progress dialog"""
         def _show_dialog():
             progress_window = tk.Toplevel(self.parent_window)
+            self._progress_window = progress_window
             progress_window.title("Downloading Update")
             progress_window.geometry("400x150")
             progress_window.transient(self.parent_window)
@@ -141,6 +185,18 @@ Would you like to download and install the update?"""
         if self.parent_window:
             self.parent_window.after(0, _show_dialog)
     
+    def _close_download_progress(self):
+        """Destroy the download progress dialog if it is showing"""
+        def _close_dialog():
+            if self._progress_window is not None:
+                if self._progress_window.winfo_exists():
+                    self._progress_window.grab_release()
+                    self._progress_window.destroy()
+                self._progress_window = None
+        
+        if self.parent_window:
+            self.parent_window.after(0, _close_dialog)
+    
     def _install_update(self, dmg_path, latest_version):
         """Install the update by mounting DMG and replacing the app"""
         try:
@@ -176,8 +232,7 @@ Would you like to download and install the update?"""
             # Unmount the DMG
             subprocess.run(['hdiutil', 'detach', mount_path], capture_output=True)
             
-            # Clean up downloaded DMG
-            os.remove(dmg_path)
+            # The DMG stays in the shared cache for other instances until evicted
             
             # Show success message
             self._show_success_message(latest_version)
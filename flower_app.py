@@ -5,6 +5,7 @@ A simple Python application that displays an animated flower.
 Perfect for packaging as a standalone macOS app with auto-update capabilities.
 """
 
+import argparse
 import tkinter as tk
 from tkinter import ttk
 import math
@@ -12,12 +13,22 @@ import random
 from PIL import Image, ImageDraw, ImageTk
 import threading
 import time
-from version import __version__, __app_name__
+from version import __version__, __app_name__, UPDATE_CHANNEL, UPDATE_PIN
 from app_updater import check_for_updates_startup, check_for_updates_manual
+from level_of_detail import DetailController
+from loop_profiler import LoopProfiler
+from release_index import check_update_settings
+
+# Delay between animation frames in milliseconds
+FRAME_INTERVAL_MS = 50
+
+# Refresh the detail label about once a second
+DETAIL_REPORT_FRAMES = 20
 
 class FlowerApp:
-    def __init__(self, root):
+    def __init__(self, root, auto_start=True):
         self.root = root
+        self.auto_start = auto_start
         self.root.title("Beautiful Flower Display")
         self.root.geometry("800x600")
         self.root.configure(bg='#2c3e50')
@@ -34,11 +45,17 @@ class FlowerApp:
         self.petal_scale = 1.0
         self.scale_direction = 1
         
+        # Level of detail, stepped down when frames overrun
+        self.detail = DetailController()
+        self._frames_since_report = 0
+        self._frame_scheduled_at = None
+        
         # Setup UI
         self.setup_ui()
         
-        # Start animation
-        self.animate_flower()
+        # Start animation (drivers such as the soak harness step frames themselves)
+        if self.auto_start:
+            self.animate_flower()
     
     def center_window(self):
         """Center the window on the screen"""
@@ -71,6 +88,16 @@ class FlowerApp:
         )
         version_label.pack()
         
+        # Current rendering detail level
+        self.detail_label = tk.Label(
+            self.root,
+            text=self.detail.report(),
+            font=("Helvetica", 10),
+            fg='#7f8c8d',
+            bg='#2c3e50'
+        )
+        self.detail_label.pack()
+        
         # Canvas for flower
         self.canvas = tk.Canvas(
             self.root,
@@ -129,7 +156,8 @@ class FlowerApp:
         self.generate_new_flower()
         
         # Check for updates on startup (silent)
-        self.root.after(2000, lambda: check_for_updates_startup(self.root))
+        if self.auto_start:
+            self.root.after(2000, lambda: check_for_updates_startup(self.root))
     
     def draw_flower(self):
         """Draw a beautiful flower on the canvas"""
@@ -137,6 +165,15 @@ class FlowerApp:
         
         center_x, center_y = 200, 200
         
+        # Pick drawing detail for the current size
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        if canvas_width <= 1 or canvas_height <= 1:
+            # Not mapped yet, fall back to the configured size
+            canvas_width = int(self.canvas.cget('width'))
+            canvas_height = int(self.canvas.cget('height'))
+        detail = self.detail.detail_for(self.petal_scale, canvas_width, canvas_height)
+        
         # Draw stem
         self.canvas.create_line(
             center_x, center_y + 50, center_x, center_y + 150,
@@ -146,7 +183,7 @@ class FlowerApp:
         # Draw leaves
         for i, (leaf_x, leaf_y) in enumerate([(center_x - 30, center_y + 80), (center_x + 30, center_y + 120)]):
             points = []
-            for angle in range(0, 360, 10):
+            for angle in range(0, 360, detail['leaf_step']):
                 radius = 15 + 10 * math.sin(math.radians(angle * 3))
                 x = leaf_x + radius * math.cos(math.radians(angle))
                 y = leaf_y + radius * 0.5 * math.sin(math.radians(angle))
@@ -172,9 +209,11 @@ class FlowerApp:
         num_petals = 8
         for i in range(num_petals):
             angle = (360 / num_petals) * i + self.petal_rotation
-            self.draw_petal(center_x, center_y, angle, self.petal_scale)
+            self.draw_petal(center_x, center_y, angle, self.petal_scale, detail)
         
         # Draw small dots in center for detail
+        if not detail['draw_dots']:
+            return
         for i in range(8):
             angle = i * 45 + self.petal_rotation * 2
             dot_x = center_x + 8 * math.cos(math.radians(angle))
@@ -184,8 +223,11 @@ class FlowerApp:
                 fill='#e67e22', outline=''
             )
     
-    def draw_petal(self, center_x, center_y, angle, scale):
+    def draw_petal(self, center_x, center_y, angle, scale, detail=None):
         """Draw a single petal at the given angle"""
+        if detail is None:
+            detail = self.detail.detail_for(scale, 400, 400)
+        
         # Petal dimensions
         petal_length = 40 * scale
         petal_width = 20 * scale
@@ -217,11 +259,28 @@ class FlowerApp:
             fill=color,
             outline='#ffffff',
             width=1,
-            smooth=True
+            smooth=detail['smooth'],
+            splinesteps=detail['splinesteps']
         )
     
     def animate_flower(self):
         """Animate the flower with rotation and scaling"""
+        # Time the main loop spent past our scheduled delay (rendering, other callbacks)
+        if self._frame_scheduled_at is not None:
+            late_ms = (time.perf_counter() - self._frame_scheduled_at) * 1000 - FRAME_INTERVAL_MS
+        else:
+            late_ms = 0.0
+        
+        self.advance_frame(max(0.0, late_ms))
+        
+        # Schedule next frame
+        self._frame_scheduled_at = time.perf_counter()
+        self.root.after(FRAME_INTERVAL_MS, self.animate_flower)
+    
+    def advance_frame(self, late_ms=0.0):
+        """Advance the animation by one frame and redraw"""
+        frame_start = time.perf_counter()
+        
         if self.animation_running:
             # Update rotation
             self.petal_rotation += 2
@@ -237,9 +296,14 @@ class FlowerApp:
             
             # Redraw flower
             self.draw_flower()
-        
-        # Schedule next frame
-        self.root.after(50, self.animate_flower)
+            
+            # Let the detail level follow the measured frame cost
+            draw_ms = (time.perf_counter() - frame_start) * 1000
+            level_changed = self.detail.record_frame(draw_ms + late_ms)
+            self._frames_since_report += 1
+            if level_changed or self._frames_since_report >= DETAIL_REPORT_FRAMES:
+                self.detail_label.config(text=self.detail.report())
+                self._frames_since_report = 0
     
     def toggle_animation(self):
         """Toggle animation on/off"""
@@ -264,11 +328,33 @@ class FlowerApp:
         check_for_updates_manual(self.root)
 
 
-def main():
+def main(argv=None):
     """Main function to run the flower app"""
+    parser = argparse.ArgumentParser(description=__app_name__)
+    parser.add_argument('--profile', action='store_true',
+                        help="time every Tk callback and report on exit")
+    parser.add_argument('--profile-stall-ms', type=float, default=100.0,
+                        help="flag callbacks or loop delays longer than this")
+    parser.add_argument('--profile-output',
+                        help="also write cProfile stats for the main thread to this file")
+    # The macOS app launcher can pass extra arguments (e.g. -psn_...), ignore them
+    args, _ = parser.parse_known_args(argv)
+    
+    # Catch a bad channel or pin now rather than on every update check
+    try:
+        check_update_settings(UPDATE_CHANNEL, UPDATE_PIN)
+    except ValueError as e:
+        parser.error(str(e))
+    
     # Create the main window
     root = tk.Tk()
     
+    # Instrument the event loop before any widgets register callbacks
+    profiler = None
+    if args.profile or args.profile_output:
+        profiler = LoopProfiler(args.profile_stall_ms, profile_output=args.profile_output)
+        profiler.install(root)
+    
     # Set app icon (using emoji for simplicity)
     try:
         # For macOS, set the app to appear in dock properly
@@ -289,7 +375,12 @@ def main():
     root.protocol("WM_DELETE_WINDOW", on_closing)
     
     # Start the GUI event loop
-    root.mainloop()
+    try:
+        root.mainloop()
+    finally:
+        if profiler is not None:
+            profiler.uninstall()
+            print(profiler.report())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+"""
+Level-of-detail control for the flower animation
+Picks how much work each frame does based on flower size and frame timing
+"""
+
+# Detail levels from richest to cheapest. Tk rasterizes smoothed polygons
+# as splines, so spline steps are the main cost of a frame; leaf outlines
+# and the dot ring are trimmed as detail drops.
+DETAIL_LEVELS = [
+    {'name': 'high', 'smooth': True, 'splinesteps': 12, 'leaf_step': 10, 'draw_dots': True},
+    {'name': 'medium', 'smooth': True, 'splinesteps': 6, 'leaf_step': 20, 'draw_dots': True},
+    {'name': 'low', 'smooth': True, 'splinesteps': 3, 'leaf_step': 30, 'draw_dots': False},
+    {'name': 'minimal', 'smooth': False, 'splinesteps': 1, 'leaf_step': 45, 'draw_dots': False},
+]
+
+# Canvas size the flower geometry is designed for
+REFERENCE_CANVAS_SIZE = 400
+
+# Base petal length in pixels at scale 1.0 (matches FlowerApp.draw_petal)
+BASE_PETAL_LENGTH = 40
+
+
+class DetailController:
+    def __init__(self, frame_budget_ms=20.0, smoothing=0.2,
+                 overrun_frames=5, headroom_frames=40, headroom_ratio=0.5):
+        self.frame_budget_ms = frame_budget_ms
+        self.smoothing = smoothing
+        self.overrun_frames = overrun_frames
+        self.headroom_frames = headroom_frames
+        self.headroom_ratio = headroom_ratio
+
+        self.level = 0
+        self.average_frame_ms = None
+        self._overruns = 0
+        self._headroom = 0
+
+    @property
+    def level_name(self):
+        """Name of the current detail level"""
+        return DETAIL_LEVELS[self.level]['name']
+
+    def record_frame(self, frame_ms):
+        """Record how long a frame took and adjust the level if needed
+
+        Returns True when the detail level changed.
+        """
+        if self.average_frame_ms is None:
+            self.average_frame_ms = frame_ms
+        else:
+            self.average_frame_ms += self.smoothing * (frame_ms - self.average_frame_ms)
+
+        if self.average_frame_ms > self.frame_budget_ms:
+            self._overruns += 1
+            self._headroom = 0
+        elif self.average_frame_ms < self.frame_budget_ms * self.headroom_ratio:
+            self._headroom += 1
+            self._overruns = 0
+        else:
+            self._overruns = 0
+            self._headroom = 0
+
+        # Step down quickly when frames overrun, back up slowly with headroom
+        if self._overruns >= self.overrun_frames and self.level < len(DETAIL_LEVELS) - 1:
+            self._set_level(self.level + 1)
+            return True
+        if self._headroom >= self.headroom_frames and self.level > 0:
+            self._set_level(self.level - 1)
+            return True
+        return False
+
+    def _set_level(self, level):
+        self.level = level
+        self._overruns = 0
+        self._headroom = 0
+        # Forget the old average so the new level is judged on its own frames
+        self.average_frame_ms = None
+
+    def detail_for(self, scale, canvas_width, canvas_height):
+        """Get drawing parameters for a flower at the given scale and canvas size"""
+        detail = dict(DETAIL_LEVELS[self.level])
+
+        # Small petals on screen don't need many spline segments to look smooth.
+        # The top level always draws at full detail so it doesn't shift as petals breathe.
+        canvas_size = min(canvas_width, canvas_height)
+        petal_pixels = BASE_PETAL_LENGTH * scale * canvas_size / REFERENCE_CANVAS_SIZE
+        if self.level > 0:
+            detail['splinesteps'] = max(1, min(detail['splinesteps'], int(petal_pixels / 4)))
+
+        # Tiny flowers lose the dot ring entirely, it's only a few pixels wide
+        if petal_pixels < 20:
+            detail['draw_dots'] = False
+
+        return detail
+
+    def report(self):
+        """Human readable summary of the current level"""
+        if self.average_frame_ms is None:
+            return f"Detail: {self.level_name}"
+        return f"Detail: {self.level_name} ({self.average_frame_ms:.1f} ms/frame)"
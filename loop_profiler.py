@@ -0,0 +1,170 @@
+"""
+Profiling for the Tk event loop
+Times every after() callback and widget command that runs on the main
+thread, flags main loop stalls and can dump a cProfile stats file.
+"""
+
+import cProfile
+import threading
+import time
+import tkinter as tk
+from collections import deque
+
+# Latency samples kept per callback for percentiles (count, total and max are exact)
+MAX_SAMPLES = 10000
+
+
+class CallbackStats:
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples = deque(maxlen=MAX_SAMPLES)
+
+    def record(self, elapsed_ms):
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def percentile(self, fraction):
+        """Latency at the given fraction (0-1) of the recent samples"""
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(fraction * len(ordered)))
+        return ordered[index]
+
+
+def _callback_name(func):
+    """Readable name for a callback, e.g. FlowerApp.animate_flower"""
+    name = getattr(func, '__qualname__', None) or type(func).__name__
+    if name.endswith('<lambda>'):
+        # Tell lambdas in the same scope apart by where they are defined
+        name += f":{func.__code__.co_firstlineno}"
+    module = getattr(func, '__module__', None)
+    if module and module != '__main__':
+        return f"{module}.{name}"
+    return name
+
+
+class LoopProfiler:
+    def __init__(self, stall_threshold_ms=100.0, heartbeat_ms=20, profile_output=None):
+        self.stall_threshold_ms = stall_threshold_ms
+        self.heartbeat_ms = heartbeat_ms
+        self.profile_output = profile_output
+        self.stats = {}
+        self.stalls = []
+        self._local = threading.local()
+        self._originals = None
+        self._root = None
+        self._heartbeat_at = None
+        self._callback_ms_since_heartbeat = 0.0
+        self._cprofile = None
+
+    def _wrap(self, func):
+        """Wrap a callback so each call is timed"""
+        name = _callback_name(func)
+        profiler = self
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profiler._record(name, (time.perf_counter() - start) * 1000)
+
+        timed.__qualname__ = getattr(func, '__qualname__', name)
+        return timed
+
+    def _record(self, name, elapsed_ms):
+        stats = self.stats.get(name)
+        if stats is None:
+            stats = self.stats[name] = CallbackStats()
+        stats.record(elapsed_ms)
+        self._callback_ms_since_heartbeat += elapsed_ms
+        if elapsed_ms > self.stall_threshold_ms:
+            self._flag_stall(name, elapsed_ms)
+
+    def _flag_stall(self, name, elapsed_ms):
+        self.stalls.append((name, elapsed_ms))
+        print(f"⚠️ Main loop stall: {name} took {elapsed_ms:.1f} ms")
+
+    def install(self, root):
+        """Start timing callbacks; call before widgets are created"""
+        profiler = self
+        original_after = tk.Misc.after
+        original_register = tk.Misc._register
+        original_public_register = tk.Misc.register
+        self._originals = (original_after, original_register, original_public_register)
+
+        def after(widget, ms, func=None, *args):
+            if func is None:
+                return original_after(widget, ms)
+            # after() registers its own trampoline; time the real callback instead
+            profiler._local.in_after = True
+            try:
+                return original_after(widget, ms, profiler._wrap(func), *args)
+            finally:
+                profiler._local.in_after = False
+
+        def _register(widget, func, subst=None, needcleanup=1):
+            # Button commands, bindings and protocol handlers all come through here
+            if not getattr(profiler._local, 'in_after', False):
+                func = profiler._wrap(func)
+            return original_register(widget, func, subst, needcleanup)
+
+        # after_idle() goes through after(), so it is covered too
+        tk.Misc.after = after
+        tk.Misc._register = _register
+        tk.Misc.register = _register
+
+        self._root = root
+        self._schedule_heartbeat()
+
+        if self.profile_output:
+            self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _schedule_heartbeat(self):
+        """Schedule the next heartbeat without timing it as a callback"""
+        self._heartbeat_at = time.perf_counter()
+        self._callback_ms_since_heartbeat = 0.0
+        self._local.in_after = True
+        try:
+            self._originals[0](self._root, self.heartbeat_ms, self._heartbeat)
+        finally:
+            self._local.in_after = False
+
+    def _heartbeat(self):
+        """Catch stalls outside our callbacks, such as Tk redrawing the canvas"""
+        late_ms = (time.perf_counter() - self._heartbeat_at) * 1000 - self.heartbeat_ms
+        # Time spent in our own callbacks is already flagged under their names
+        late_ms -= self._callback_ms_since_heartbeat
+        if late_ms > self.stall_threshold_ms:
+            self._flag_stall("main loop", late_ms)
+        if self._originals is not None:
+            self._schedule_heartbeat()
+
+    def uninstall(self):
+        """Stop timing callbacks and write the cProfile stats if requested"""
+        if self._cprofile is not None:
+            self._cprofile.disable()
+            self._cprofile.dump_stats(self.profile_output)
+            print(f"cProfile stats written to {self.profile_output}")
+            self._cprofile = None
+
+        if self._originals is not None:
+            tk.Misc.after, tk.Misc._register, tk.Misc.register = self._originals
+            self._originals = None
+
+    def report(self):
+        """Per-callback timing table, slowest total first"""
+        lines = [f"{'callback':<50} {'count':>7} {'total ms':>10} {'p50':>8} {'p99':>8} {'max':>8}"]
+        for name, stats in sorted(self.stats.items(), key=lambda item: item[1].total_ms, reverse=True):
+            lines.append(
+                f"{name[-50:]:<50} {stats.count:>7} {stats.total_ms:>10.1f} "
+                f"{stats.percentile(0.5):>8.2f} {stats.percentile(0.99):>8.2f} {stats.max_ms:>8.2f}"
+            )
+        lines.append(f"\n{len(self.stalls)} main loop stalls over {self.stall_threshold_ms:g} ms")
+        return "\n".join(lines)
@@ -0,0 +1,179 @@
+"""
+Mirror selection for update traffic
+Races a small probe against each mirror, prefers the fastest healthy one
+and fails over to the others when a request errors or a download crawls.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import requests
+from update_cache import file_sha256
+
+# How long a race result is trusted before probing again
+DEFAULT_CHOICE_TTL = 600
+
+# Give up on a probe after this many seconds
+DEFAULT_PROBE_TIMEOUT = 3
+
+# A download slower than this over a whole window moves to the next mirror
+MIN_DOWNLOAD_BYTES_PER_SEC = 50 * 1024
+THROUGHPUT_WINDOW = 5.0
+
+# Race results shared by every selector in the process, keyed by mirror list
+_choices = {}
+_choices_lock = threading.Lock()
+
+
+class MirrorSelector:
+    def __init__(self, urls, probe_timeout=DEFAULT_PROBE_TIMEOUT, ttl=DEFAULT_CHOICE_TTL):
+        self.urls = list(urls)
+        self.probe_timeout = probe_timeout
+        self.ttl = ttl
+        self._key = tuple(self.urls)
+
+    def _probe(self, url):
+        """Time a HEAD request, returns seconds or None if the mirror is unhealthy"""
+        start = time.perf_counter()
+        try:
+            response = requests.head(url, timeout=self.probe_timeout, allow_redirects=True)
+        except requests.RequestException:
+            return None
+        if response.status_code >= 400:
+            return None
+        return time.perf_counter() - start
+
+    def race(self):
+        """Probe every mirror at once and put the first healthy responder first"""
+        executor = ThreadPoolExecutor(max_workers=len(self.urls))
+        futures = {executor.submit(self._probe, url): url for url in self.urls}
+        winner = None
+        for future in as_completed(futures):
+            if future.result() is not None:
+                winner = futures[future]
+                break
+        # Don't wait for slower probes, they time out on their own
+        executor.shutdown(wait=False)
+
+        # The rest keep their configured order as failover candidates
+        ordered = [url for url in self.urls if url != winner]
+        if winner is not None:
+            ordered.insert(0, winner)
+
+        now = time.monotonic()
+        with _choices_lock:
+            # Each release brings its own asset URLs, so drop choices nobody can reuse
+            for key in [key for key, (_, expires_at) in _choices.items() if expires_at <= now]:
+                del _choices[key]
+            _choices[self._key] = (ordered, now + self.ttl)
+        return ordered
+
+    def ordered(self):
+        """Mirrors fastest first, racing only when the cached choice has expired"""
+        if len(self.urls) <= 1:
+            return list(self.urls)
+        with _choices_lock:
+            choice = _choices.get(self._key)
+        if choice is not None and time.monotonic() < choice[1]:
+            return list(choice[0])
+        return self.race()
+
+    def invalidate(self):
+        """Forget the cached choice so the next request races again"""
+        with _choices_lock:
+            _choices.pop(self._key, None)
+
+
+def fetch_json(urls, timeout=10):
+    """GET JSON from the fastest mirror, trying the others on failure
+
+    Returns (status_code, data); data is None unless the status is 200.
+    """
+    status_code, data, _ = fetch_json_response(urls, timeout)
+    return status_code, data
+
+
+def fetch_json_response(urls, timeout=10, params=None, headers=None):
+    """Like fetch_json, also passing query params and request headers
+
+    Returns (status_code, data, response_headers). Other 2xx/3xx answers
+    such as 304 Not Modified are final; errors move on to the next mirror.
+    """
+    selector = MirrorSelector(urls)
+    status_code = None
+    last_error = None
+    for url in selector.ordered():
+        try:
+            response = requests.get(url, params=params, headers=headers, timeout=timeout)
+        except requests.RequestException as e:
+            last_error = e
+            selector.invalidate()
+            continue
+        if response.status_code == 200:
+            try:
+                return response.status_code, response.json(), response.headers
+            except ValueError as e:
+                # A captive portal or broken mirror answering with HTML
+                last_error = e
+                selector.invalidate()
+                continue
+        if response.status_code < 400:
+            return response.status_code, None, response.headers
+        status_code = response.status_code
+        selector.invalidate()
+
+    if status_code is None:
+        raise last_error
+    return status_code, None, {}
+
+
+def download(urls, path, expected_sha256=None, min_bytes_per_sec=MIN_DOWNLOAD_BYTES_PER_SEC,
+             window=THROUGHPUT_WINDOW, timeout=(5, 30)):
+    """Download a file from the fastest mirror, failing over mid-download
+
+    When the expected sha256 is known a download that moves to another mirror
+    resumes with a Range request; otherwise it starts over so bytes from
+    different mirrors are never mixed unchecked. Returns the URL that finished.
+    """
+    selector = MirrorSelector(urls)
+    offset = 0
+    last_error = None
+    candidates = selector.ordered()
+    for position, url in enumerate(candidates):
+        # A slow download beats none, so the last mirror is never abandoned for speed
+        has_fallback = position < len(candidates) - 1
+        try:
+            headers = {'Range': f"bytes={offset}-"} if offset and expected_sha256 else {}
+            response = requests.get(url, stream=True, headers=headers, timeout=timeout)
+            response.raise_for_status()
+
+            resumed = (response.status_code == 206 and
+                       response.headers.get('Content-Range', '').startswith(f"bytes {offset}-"))
+            if not resumed:
+                offset = 0
+
+            with open(path, 'ab' if resumed else 'wb') as f:
+                window_start = time.monotonic()
+                window_bytes = 0
+                for chunk in response.iter_content(chunk_size=8192):
+                    f.write(chunk)
+                    offset += len(chunk)
+                    window_bytes += len(chunk)
+
+                    elapsed = time.monotonic() - window_start
+                    if elapsed >= window:
+                        if has_fallback and window_bytes / elapsed < min_bytes_per_sec:
+                            raise Exception(f"Throughput from {url} dropped to {window_bytes / elapsed:.0f} B/s")
+                        window_start = time.monotonic()
+                        window_bytes = 0
+
+            if expected_sha256 and file_sha256(path) != expected_sha256:
+                offset = 0
+                raise Exception(f"Download from {url} failed integrity check")
+            return url
+
+        except Exception as e:
+            last_error = e
+            selector.invalidate()
+
+    raise Exception(f"All mirrors failed: {last_error}")
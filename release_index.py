@@ -0,0 +1,264 @@
+"""
+Release index for Beautiful Flower Display
+Keeps every published release on disk, sorted by version, so picking the
+best update for a channel is a local binary search instead of a request.
+
+Each release is stored as a compact array:
+    [version, tag_name, id, channel, body, dmg_name, dmg_url, dmg_digest]
+ordered by ascending version. Syncing only asks for pages down to the first
+one holding a release already in the index, refreshing the known releases on
+it, and races RELEASES_MIRRORS like other metadata.
+"""
+
+import bisect
+import json
+import os
+import time
+from functools import lru_cache
+import requests
+from packaging import version
+from version import RELEASES_MIRRORS
+import mirrors
+
+VERSION, TAG, ID, CHANNEL, BODY, DMG_NAME, DMG_URL, DMG_DIGEST = range(8)
+
+# A channel also receives every channel before it
+CHANNELS = ('stable', 'beta')
+
+RELEASES_PER_PAGE = 100
+
+# Walk every page again this often to pick up edited or deleted releases
+FULL_SYNC_INTERVAL = 24 * 60 * 60
+
+# Loaded indexes shared by every ReleaseIndex in the process, keyed by path:
+# path -> [mtime, data, per-channel entry lists or None until first lookup]
+_loaded = {}
+
+
+@lru_cache(maxsize=None)
+def _parse(version_string):
+    return version.parse(version_string)
+
+
+def _pin_upper_bound(pin):
+    """Lowest version outside a pinned prefix, e.g. "1.2" -> 1.3.dev0"""
+    parts = [int(part) for part in pin.split('.')]
+    parts[-1] += 1
+    return _parse('.'.join(str(part) for part in parts) + '.dev0')
+
+
+def check_update_settings(channel, pin=None):
+    """Raise ValueError for an unknown channel or a pin that isn't a version prefix"""
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown update channel {channel!r}, expected one of {', '.join(CHANNELS)}")
+    if pin is not None:
+        try:
+            _pin_upper_bound(pin)
+        except ValueError:
+            raise ValueError(f"Update pin must be a version prefix such as 1.2, got {pin!r}")
+
+
+def fetch_release_page(page, etag=None):
+    """Fetch one page of releases from the fastest mirror, returns (status_code, releases, etag)"""
+    headers = {'If-None-Match': etag} if etag else {}
+    status_code, releases, response_headers = mirrors.fetch_json_response(
+        RELEASES_MIRRORS,
+        timeout=10,
+        params={'per_page': RELEASES_PER_PAGE, 'page': page},
+        headers=headers
+    )
+    return status_code, releases, response_headers.get('ETag')
+
+
+def _entry(release):
+    """Compact index entry for a GitHub release, or None if it can't be offered"""
+    if release.get('draft'):
+        return None
+    version_string = release['tag_name'].lstrip('v')
+    try:
+        parsed = _parse(version_string)
+    except version.InvalidVersion:
+        return None
+
+    channel = 'beta' if release.get('prerelease') or parsed.is_prerelease else 'stable'
+    dmg_name = dmg_url = dmg_digest = None
+    for asset in release.get('assets', []):
+        if asset['name'].endswith('.dmg'):
+            dmg_name = asset['name']
+            dmg_url = asset['browser_download_url']
+            dmg_digest = asset.get('digest')
+            break
+
+    body = (release.get('body') or 'No release notes available')[:200]
+    return [version_string, release['tag_name'], release.get('id'), channel, body, dmg_name, dmg_url, dmg_digest]
+
+
+def offers(release_data, current_version, channel='stable', skipped=(), pin=None):
+    """Whether a single release, e.g. from /releases/latest, may be offered
+
+    Applies the same channel, skip and pin rules as ReleaseIndex.best_update.
+    """
+    entry = _entry(release_data)
+    if entry is None or CHANNELS.index(entry[CHANNEL]) > CHANNELS.index(channel):
+        return False
+    if entry[VERSION] in skipped:
+        return False
+    parsed = _parse(entry[VERSION])
+    if pin is not None and parsed >= _pin_upper_bound(pin):
+        return False
+    return parsed > _parse(current_version)
+
+
+def as_release_data(entry):
+    """Turn an index entry back into the shape of a GitHub release"""
+    assets = []
+    if entry[DMG_URL]:
+        asset = {'name': entry[DMG_NAME], 'browser_download_url': entry[DMG_URL]}
+        if entry[DMG_DIGEST]:
+            asset['digest'] = entry[DMG_DIGEST]
+        assets.append(asset)
+    return {
+        'tag_name': entry[TAG],
+        'id': entry[ID],
+        'prerelease': entry[CHANNEL] != 'stable',
+        'body': entry[BODY],
+        'assets': assets,
+    }
+
+
+class ReleaseIndex:
+    def __init__(self, cache, fetch_page=fetch_release_page):
+        self.cache = cache
+        self.fetch_page = fetch_page
+        self.path = os.path.join(cache.cache_dir, "releases-index.json")
+
+    def _load(self):
+        """Load the index from disk if it changed since the last load"""
+        try:
+            mtime = os.stat(self.path).st_mtime
+        except OSError:
+            _loaded.pop(self.path, None)
+            return None
+        loaded = _loaded.get(self.path)
+        if loaded is None or loaded[0] != mtime:
+            with open(self.path, 'r') as f:
+                loaded = _loaded[self.path] = [mtime, json.load(f), None]
+        return loaded[1]
+
+    def _is_fresh(self, data):
+        return data is not None and time.time() - data['synced_at'] <= self.cache.metadata_ttl
+
+    def sync(self):
+        """Bring the index up to date, only requesting pages down to its head"""
+        if self._is_fresh(self._load()):
+            return
+
+        with self.cache.locked("release-index"):
+            # Another process may have synced while we waited
+            data = self._load()
+            if self._is_fresh(data):
+                return
+
+            now = time.time()
+            if data is None or now - data['full_synced_at'] > FULL_SYNC_INTERVAL:
+                data = {'releases': [], 'etag': None, 'full_synced_at': now}
+            else:
+                # Work on a copy; the loaded index stays untouched if the sync fails
+                data = dict(data, releases=list(data['releases']))
+            known_ids = {entry[ID] for entry in data['releases']}
+
+            new_entries = []
+            # Known releases seen again, replaced in case their assets or channel changed
+            updated = {}
+            seen_ids = set()
+            page = 1
+            while True:
+                etag = data['etag'] if page == 1 else None
+                status_code, releases, page_etag = self.fetch_page(page, etag)
+                if status_code == 304:
+                    # Nothing published since the last sync
+                    break
+                if status_code != 200:
+                    raise requests.HTTPError(f"Failed to fetch releases (HTTP {status_code})")
+                if page == 1:
+                    data['etag'] = page_etag
+
+                reached_head = False
+                for release in releases:
+                    # A repeated release also ends paging, e.g. a mirror ignoring ?page=
+                    if release['id'] in seen_ids:
+                        reached_head = True
+                        break
+                    seen_ids.add(release['id'])
+                    entry = _entry(release)
+                    if release['id'] in known_ids:
+                        # Finish the page so every known release on it is refreshed
+                        reached_head = True
+                        updated[release['id']] = entry
+                    elif entry is not None:
+                        new_entries.append(entry)
+                if reached_head or len(releases) < RELEASES_PER_PAGE:
+                    break
+                page += 1
+
+            # Keep the stored list sorted so lookups never have to sort
+            releases = data['releases']
+            if updated:
+                releases[:] = [entry for entry in releases if entry[ID] not in updated]
+                new_entries.extend(entry for entry in updated.values() if entry is not None)
+            keys = [_parse(entry[VERSION]) for entry in releases]
+            for entry in new_entries:
+                key = _parse(entry[VERSION])
+                position = bisect.bisect_left(keys, key)
+                keys.insert(position, key)
+                releases.insert(position, entry)
+
+            data['synced_at'] = now
+            self.cache.write_atomic(self.path, json.dumps(data, separators=(',', ':')).encode())
+            _loaded[self.path] = [os.stat(self.path).st_mtime, data, None]
+
+    def _channel_entries(self, channel):
+        if channel not in CHANNELS:
+            raise ValueError(f"Unknown update channel: {channel}")
+        data = self._load()
+        if data is None:
+            return []
+        loaded = _loaded[self.path]
+        if loaded[2] is None:
+            # Split once per load; the stored order carries over to each channel
+            loaded[2] = {
+                name: [entry for entry in data['releases']
+                       if CHANNELS.index(entry[CHANNEL]) <= CHANNELS.index(name)]
+                for name in CHANNELS
+            }
+        return loaded[2][channel]
+
+    def _bisect(self, entries, key):
+        """Index of the first entry whose version is not below key"""
+        low, high = 0, len(entries)
+        while low < high:
+            middle = (low + high) // 2
+            if _parse(entries[middle][VERSION]) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def best_update(self, current_version, channel='stable', skipped=(), pin=None):
+        """Newest release on a channel that is newer than current_version
+
+        Honors skipped versions and a pinned version prefix. Returns the
+        release in GitHub's shape, or None when there is nothing to offer.
+        """
+        entries = self._channel_entries(channel)
+        current = _parse(current_version)
+        skipped = set(skipped)
+
+        end = len(entries) if pin is None else self._bisect(entries, _pin_upper_bound(pin))
+        for position in range(end - 1, -1, -1):
+            entry = entries[position]
+            if _parse(entry[VERSION]) <= current:
+                return None
+            if entry[VERSION] not in skipped:
+                return as_release_data(entry)
+        return None
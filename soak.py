@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+Soak test for Beautiful Flower Display
+Runs the animation and simulated update checks for hours of simulated time
+and fails if memory, threads, Tk widgets or canvas items grow without bound.
+
+Needs a display; on a headless machine run it under Xvfb:
+    xvfb-run python3 soak.py --hours 4
+"""
+
+import argparse
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import tkinter as tk
+from flower_app import FlowerApp, FRAME_INTERVAL_MS
+from app_updater import AppUpdater
+from update_cache import UpdateCache
+
+
+class SimulatedUpdater(AppUpdater):
+    """AppUpdater that serves a fake release instead of talking to GitHub"""
+
+    def __init__(self, parent_window=None, cache=None, latest_version="99.0.0"):
+        super().__init__(parent_window, cache)
+        self.latest_version = latest_version
+        self.errors = []
+
+    def _fetch_latest_release(self):
+        return 200, {
+            'tag_name': f"v{self.latest_version}",
+            'body': "Simulated release for soak testing",
+            'assets': [{
+                'name': f"Beautiful-Flower-Display-{self.latest_version}.dmg",
+                'browser_download_url': "simulated://release.dmg",
+            }],
+        }
+
+    def _fetch_release_page(self, page, etag=None):
+        _, release_data = self._fetch_latest_release()
+        release_data['id'] = 1
+        return 200, [release_data] if page == 1 else [], None
+
+    def _show_update_dialog(self, latest_version, release_data):
+        # Accept the update without a modal prompt
+        self.parent_window.after(0, lambda: self._download_and_install_update(latest_version, release_data))
+
+    def _download_file(self, download_urls, dmg_path, expected_sha256=None):
+        with open(dmg_path, 'wb') as f:
+            f.write(b'\0' * 8192)
+
+    def _install_update(self, dmg_path, latest_version):
+        pass
+
+    def _show_no_update_message(self):
+        # The simulated release is always newer, so this means the check broke
+        self.errors.append("Simulated update check found no update")
+
+    def _show_error_message(self, error):
+        self.errors.append(error)
+
+
+def count_widgets(widget):
+    """Count a widget and all of its descendants"""
+    return 1 + sum(count_widgets(child) for child in widget.winfo_children())
+
+
+def grows_without_bound(values, slack):
+    """Check whether the peak of the second half of a series exceeds the first half's"""
+    half = len(values) // 2
+    return max(values[half:]) > max(values[:half]) + slack
+
+
+# Fewer samples than this after warmup can't show a trend
+MIN_SAMPLES = 4
+
+
+class SoakRunner:
+    # Allowed growth between the first and second half of the run
+    SLACK = {
+        'threads': 2,          # Update threads that are still finishing
+        'widgets': 1,          # Progress dialog that is still closing
+        'canvas_items': 8,     # Detail level changes add or drop the dot ring
+        'memory_bytes': 1024 * 1024,
+    }
+
+    def __init__(self, hours=4.0, check_interval=300, sample_interval=600, warmup=600):
+        self.hours = hours
+        self.check_interval = check_interval
+        self.sample_interval = sample_interval
+        self.warmup = warmup
+        self.samples = []
+        self.errors = []
+
+    def run(self):
+        """Run the soak and return True if nothing leaked"""
+        total_frames = int(self.hours * 3600 * 1000 / FRAME_INTERVAL_MS)
+        frames_per_check = max(1, int(self.check_interval * 1000 / FRAME_INTERVAL_MS))
+        frames_per_sample = max(1, int(self.sample_interval * 1000 / FRAME_INTERVAL_MS))
+        warmup_frames = int(self.warmup * 1000 / FRAME_INTERVAL_MS)
+
+        samples = total_frames // frames_per_sample - warmup_frames // frames_per_sample
+        if samples < MIN_SAMPLES:
+            raise ValueError(
+                f"Only {samples} samples after warmup, need at least {MIN_SAMPLES}; "
+                "run longer or sample more often"
+            )
+
+        root = tk.Tk()
+        app = FlowerApp(root, auto_start=False)
+
+        # Private cache so the soak never touches the user's real one
+        cache_dir = tempfile.mkdtemp(prefix="flower-soak-")
+        cache = UpdateCache(cache_dir, metadata_ttl=self.check_interval / 2)
+
+        tracemalloc.start()
+        baseline_snapshot = None
+        started = time.perf_counter()
+
+        try:
+            for frame in range(1, total_frames + 1):
+                app.advance_frame()
+
+                if frame % frames_per_check == 0:
+                    updater = SimulatedUpdater(root, cache)
+                    updater.errors = self.errors
+                    # Report every outcome so a broken check can't fail silently
+                    updater.check_for_updates(show_no_update_message=True)
+
+                root.update()
+
+                if frame == warmup_frames:
+                    baseline_snapshot = tracemalloc.take_snapshot()
+                if frame > warmup_frames and frame % frames_per_sample == 0:
+                    self._sample(root, app, frame)
+        finally:
+            final_snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            root.destroy()
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+        elapsed = time.perf_counter() - started
+        print(f"Simulated {self.hours:g} hours ({total_frames} frames) in {elapsed:.1f}s")
+        return self._report(baseline_snapshot, final_snapshot)
+
+    def _sample(self, root, app, frame):
+        items = app.canvas.find_all()
+        self.samples.append({
+            'sim_seconds': frame * FRAME_INTERVAL_MS / 1000,
+            'memory_bytes': tracemalloc.get_traced_memory()[0],
+            'threads': threading.active_count(),
+            'widgets': count_widgets(root),
+            'canvas_items': len(items),
+            # Tk never reuses item IDs, so this climbs by design; reported only
+            'last_item_id': max(items) if items else 0,
+        })
+
+    def _report(self, baseline_snapshot, final_snapshot):
+        print(f"{'sim time':>10} {'memory':>12} {'threads':>8} {'widgets':>8} {'items':>6} {'last id':>10}")
+        for sample in self.samples:
+            print(f"{sample['sim_seconds'] / 3600:>9.2f}h {sample['memory_bytes']:>12} "
+                  f"{sample['threads']:>8} {sample['widgets']:>8} "
+                  f"{sample['canvas_items']:>6} {sample['last_item_id']:>10}")
+
+        if baseline_snapshot is not None:
+            print("\nTop allocation growth since warmup:")
+            for stat in final_snapshot.compare_to(baseline_snapshot, 'lineno')[:10]:
+                print(f"  {stat}")
+
+        ok = True
+        for metric, slack in self.SLACK.items():
+            values = [sample[metric] for sample in self.samples]
+            if grows_without_bound(values, slack):
+                print(f"❌ {metric} keeps growing: {values[0]} -> {values[-1]}")
+                ok = False
+
+        for error in self.errors:
+            print(f"❌ Simulated update failed: {error}")
+            ok = False
+
+        if ok:
+            print("✅ No unbounded growth detected")
+        return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak test the flower app")
+    parser.add_argument('--hours', type=float, default=4.0, help="simulated hours to run")
+    parser.add_argument('--check-interval', type=float, default=300,
+                        help="simulated seconds between update checks")
+    parser.add_argument('--sample-interval', type=float, default=600,
+                        help="simulated seconds between resource samples")
+    parser.add_argument('--warmup', type=float, default=600,
+                        help="simulated seconds before the baseline is taken")
+    args = parser.parse_args()
+
+    runner = SoakRunner(args.hours, args.check_interval, args.sample_interval, args.warmup)
+    try:
+        ok = runner.run()
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    except tk.TclError as e:
+        print(f"❌ Could not start Tk ({e}). On a headless machine run under xvfb-run.")
+        sys.exit(2)
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script for adaptive level of detail: stepping with frame timing and
+per-size drawing parameters
+"""
+
+from level_of_detail import DetailController, DETAIL_LEVELS
+
+
+def test_overruns_step_down():
+    print("Testing that sustained overruns lower the detail...")
+    controller = DetailController(frame_budget_ms=20.0)
+    levels = []
+    for _ in range(100):
+        controller.record_frame(40.0)
+        levels.append(controller.level)
+
+    assert levels == sorted(levels), "detail should only go down while frames overrun"
+    assert controller.level_name == 'minimal'
+    assert max(levels) == len(DETAIL_LEVELS) - 1, "level should stop at the cheapest one"
+    assert "ms/frame" in controller.report()
+    print(f"✅ Stepped down to {controller.level_name}")
+
+
+def test_single_spike_ignored():
+    print("\nTesting that a short spike doesn't change the level...")
+    controller = DetailController(frame_budget_ms=20.0)
+    for _ in range(10):
+        controller.record_frame(15.0)
+    controller.record_frame(60.0)
+    for _ in range(10):
+        controller.record_frame(15.0)
+    assert controller.level == 0
+    print("✅ Spike absorbed by the moving average")
+
+
+def test_headroom_steps_up():
+    print("\nTesting that headroom brings the detail back...")
+    controller = DetailController(frame_budget_ms=20.0, headroom_frames=40)
+    while controller.level < len(DETAIL_LEVELS) - 1:
+        controller.record_frame(40.0)
+
+    changes = 0
+    for _ in range(1000):
+        if controller.record_frame(2.0):
+            changes += 1
+        assert 0 <= controller.level < len(DETAIL_LEVELS)
+
+    assert controller.level_name == 'high'
+    assert changes == len(DETAIL_LEVELS) - 1, "each change should move one level at a time"
+    print("✅ Stepped back up to high and stayed there")
+
+
+def test_detail_for_sizes():
+    print("\nTesting drawing parameters for different flower sizes...")
+    controller = DetailController()
+
+    # The top level never varies with the breathing scale
+    for scale in (0.8, 0.9, 1.0, 1.1, 1.2):
+        assert controller.detail_for(scale, 400, 400)['splinesteps'] == 12
+
+    # Below it, small petals get fewer spline steps and no dot ring
+    controller.level = 1
+    full = controller.detail_for(1.0, 400, 400)
+    assert full['splinesteps'] == 6 and full['draw_dots']
+    small = controller.detail_for(0.3, 100, 100)
+    assert small['splinesteps'] == 1 and not small['draw_dots']
+
+    # A tiny flower drops the dots even at the top level
+    controller.level = 0
+    tiny = controller.detail_for(0.8, 200, 200)
+    assert tiny['splinesteps'] == 12 and not tiny['draw_dots']
+    print("✅ Small petals drawn cheaper")
+
+
+if __name__ == "__main__":
+    print("🔍 Testing level of detail...\n")
+    test_overruns_step_down()
+    test_single_spike_ignored()
+    test_headroom_steps_up()
+    test_detail_for_sizes()
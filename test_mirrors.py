@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for mirror racing and download failover using local HTTP
+servers with injected latency
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import mirrors
+
+DATA = os.urandom(400 * 1024)
+DATA_SHA256 = hashlib.sha256(DATA).hexdigest()
+
+
+def start_mirror(latency=0.0, body=DATA, content_type='application/octet-stream', collapse_after=None):
+    """Serve body on a local port, returns (url, list of Range headers received)"""
+    ranges = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_HEAD(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+
+        def do_GET(self):
+            time.sleep(latency)
+            start = 0
+            requested = self.headers.get('Range')
+            ranges.append(requested)
+            if requested:
+                start = int(requested.split('=')[1].split('-')[0])
+                self.send_response(206)
+                self.send_header('Content-Range', f"bytes {start}-{len(body) - 1}/{len(body)}")
+            else:
+                self.send_response(200)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body) - start))
+            self.end_headers()
+            for offset in range(start, len(body), 8192):
+                if collapse_after is not None and offset >= collapse_after:
+                    # Throughput collapses to a trickle
+                    time.sleep(0.5)
+                try:
+                    self.wfile.write(body[offset:offset + 8192])
+                except OSError:
+                    return
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}/release.dmg", ranges
+
+
+def test_race_prefers_fastest():
+    print("Testing that the fastest healthy mirror wins the race...")
+    slow, _ = start_mirror(latency=0.4)
+    fast, _ = start_mirror(latency=0.0)
+    medium, _ = start_mirror(latency=0.2)
+    broken = "http://127.0.0.1:1/release.dmg"
+
+    ordered = mirrors.MirrorSelector([broken, slow, fast, medium]).race()
+    assert ordered[0] == fast, f"expected the fast mirror first, got {ordered}"
+    assert sorted(ordered) == sorted([broken, slow, fast, medium])
+    print("✅ Fastest mirror chosen, others kept for failover")
+
+
+def test_fetch_json_skips_bad_mirror():
+    print("\nTesting that a mirror answering with HTML is skipped...")
+    release = {'tag_name': 'v2.0.0'}
+    portal, _ = start_mirror(body=b'<html>Sign in to Wi-Fi</html>', content_type='text/html')
+    good, _ = start_mirror(latency=0.2, body=json.dumps(release).encode(), content_type='application/json')
+
+    assert mirrors.fetch_json([portal, good]) == (200, release)
+    print("✅ Fell through to the mirror serving JSON")
+
+
+def test_failover_resumes_after_collapse():
+    print("\nTesting mid-download failover with a Range resume...")
+    collapsing, _ = start_mirror(collapse_after=100 * 1024)
+    backup, backup_ranges = start_mirror(latency=0.3)
+    path = tempfile.mktemp()
+
+    used = mirrors.download([collapsing, backup], path, DATA_SHA256, min_bytes_per_sec=50 * 1024, window=0.5)
+    assert used == backup, "download should finish on the backup mirror"
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    resumed_from = int(backup_ranges[-1].split('=')[1].split('-')[0])
+    assert resumed_from > 0, "backup mirror should be asked for the remaining bytes only"
+    print(f"✅ Resumed on the backup mirror at byte {resumed_from}")
+
+
+def test_last_mirror_finishes_when_slow():
+    print("\nTesting that a slow download on the only mirror still finishes...")
+    collapsing, _ = start_mirror(collapse_after=len(DATA) - 3 * 8192)
+    path = tempfile.mktemp()
+
+    used = mirrors.download([collapsing], path, DATA_SHA256, min_bytes_per_sec=50 * 1024, window=0.5)
+    assert used == collapsing
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+    print("✅ Last mirror allowed to finish despite low throughput")
+
+
+def test_integrity_failure_rejected():
+    print("\nTesting that a mirror serving the wrong file is rejected...")
+    tampered, _ = start_mirror(body=b'not the release' * 1000)
+    good, good_ranges = start_mirror(latency=0.2)
+    path = tempfile.mktemp()
+
+    assert mirrors.download([tampered, good], path, DATA_SHA256) == good
+    assert good_ranges[-1] is None, "a rejected download should restart from scratch"
+    with open(path, 'rb') as f:
+        assert f.read() == DATA
+
+    try:
+        mirrors.download([tampered], path, DATA_SHA256)
+        assert False, "a download that fails its integrity check should raise"
+    except Exception as e:
+        assert "integrity" in str(e)
+    print("✅ Tampered download rejected")
+
+
+def test_expired_choices_pruned():
+    print("\nTesting that expired mirror choices are dropped...")
+    first, _ = start_mirror()
+    second, _ = start_mirror()
+    third, _ = start_mirror()
+
+    mirrors.MirrorSelector([first, second], ttl=0).race()
+    mirrors.MirrorSelector([second, third]).race()
+    assert (first, second) not in mirrors._choices
+    assert (second, third) in mirrors._choices
+    print("✅ Expired choices pruned")
+
+
+if __name__ == "__main__":
+    print("🔍 Testing mirror selection...\n")
+    test_race_prefers_fastest()
+    test_fetch_json_skips_bad_mirror()
+    test_failover_resumes_after_collapse()
+    test_last_mirror_finishes_when_slow()
+    test_integrity_failure_rejected()
+    test_expired_choices_pruned()
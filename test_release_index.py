@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Test script for the release index: version selection and incremental sync
+"""
+
+import tempfile
+import requests
+from release_index import ReleaseIndex, offers, check_update_settings
+from update_cache import UpdateCache
+
+
+class FakeReleases:
+    """Paginated releases list, newest first, with ETag support"""
+
+    def __init__(self, versions):
+        self.releases = []
+        self.requests = []
+        self.fail_page = None
+        # Bumped on every change, like the ETag GitHub derives from the response
+        self.revision = 0
+        for version_string in versions:
+            self.publish(version_string)
+
+    def publish(self, version_string, prerelease=None, with_dmg=True):
+        if prerelease is None:
+            prerelease = any(tag in version_string for tag in ('a', 'b', 'rc'))
+        self.releases.append({
+            'id': len(self.releases) + 1,
+            'tag_name': f"v{version_string}",
+            'prerelease': prerelease,
+            'body': f"Notes for {version_string}",
+            'assets': [self.dmg_asset(version_string)] if with_dmg else [],
+        })
+        self.revision += 1
+
+    def dmg_asset(self, version_string):
+        return {'name': f"Beautiful-Flower-Display-{version_string}.dmg",
+                'browser_download_url': f"http://mirror/{version_string}.dmg"}
+
+    def edit(self, version_string, **changes):
+        for release in self.releases:
+            if release['tag_name'] == f"v{version_string}":
+                release.update(changes)
+        self.revision += 1
+
+    def fetch_page(self, page, etag=None):
+        self.requests.append((page, etag))
+        if page == self.fail_page:
+            raise requests.ConnectionError("mirror went away")
+        current_etag = f'"{self.revision}"'
+        if page == 1 and etag == current_etag:
+            return 304, None, None
+        newest_first = sorted(self.releases, key=lambda release: -release['id'])
+        return 200, newest_first[(page - 1) * 100:page * 100], current_etag
+
+
+def make_index(feed):
+    return ReleaseIndex(UpdateCache(tempfile.mkdtemp(), metadata_ttl=0), feed.fetch_page)
+
+
+def tag(release):
+    return release['tag_name'] if release else None
+
+
+def test_best_update():
+    print("Testing version selection...")
+    feed = FakeReleases(['1.0.0', '1.0.1', '1.0.2', '1.1.0b1', '1.1.0', '1.2.0', '1.2.1', '2.0.0rc1', '2.0.0'])
+    index = make_index(feed)
+    index.sync()
+
+    assert tag(index.best_update('1.0.2')) == 'v2.0.0'
+    assert tag(index.best_update('2.0.0')) is None
+    # Channels: beta sees prereleases, stable never does
+    feed.publish('2.1.0b1')
+    index.sync()
+    assert tag(index.best_update('2.0.0')) is None
+    assert tag(index.best_update('2.0.0', 'beta')) == 'v2.1.0b1'
+    # Pins stay inside their prefix, including its upper edge
+    assert tag(index.best_update('1.0.0', pin='1.2')) == 'v1.2.1'
+    assert tag(index.best_update('1.0.0', pin='1.0')) == 'v1.0.2'
+    assert tag(index.best_update('1.0.0', pin='1')) == 'v1.2.1'
+    assert tag(index.best_update('1.2.1', pin='1.2')) is None
+    # Skipped versions fall through to the next newest
+    assert tag(index.best_update('1.0.0', pin='1.2', skipped=['1.2.1'])) == 'v1.2.0'
+    assert tag(index.best_update('1.1.0', pin='1.1', skipped=['1.1.0'])) is None
+    print("✅ Channels, pins and skipped versions respected")
+
+
+def test_incremental_sync():
+    print("\nTesting incremental sync...")
+    # 250 releases fill three pages
+    feed = FakeReleases([f"0.{minor}.0" for minor in range(250)])
+    index = make_index(feed)
+    index.sync()
+    assert [page for page, _ in feed.requests] == [1, 2, 3]
+
+    feed.requests.clear()
+    index.sync()
+    assert feed.requests == [(1, '"250"')], "an unchanged list should cost one conditional request"
+
+    feed.requests.clear()
+    feed.publish('1.0.0')
+    index.sync()
+    assert [page for page, _ in feed.requests] == [1], "paging should stop at the cached head"
+    assert tag(index.best_update('0.249.0')) == 'v1.0.0'
+    print("✅ Only pages newer than the cached head are fetched")
+
+
+def test_edited_releases_refreshed():
+    print("\nTesting that edits to known releases are picked up...")
+    feed = FakeReleases(['1.0.0'])
+    # Published before its DMG finished uploading
+    feed.publish('1.1.0', with_dmg=False)
+    feed.publish('1.2.0', prerelease=True)
+    index = make_index(feed)
+    index.sync()
+    assert index.best_update('1.0.0')['assets'] == []
+
+    feed.edit('1.1.0', assets=[feed.dmg_asset('1.1.0')])
+    feed.edit('1.2.0', prerelease=False)
+    index.sync()
+    assert index.best_update('1.0.0', pin='1.1')['assets'], "the uploaded DMG should be offered"
+    assert tag(index.best_update('1.0.0')) == 'v1.2.0', "a promoted release should reach stable"
+
+    feed.edit('1.2.0', draft=True)
+    index.sync()
+    assert tag(index.best_update('1.0.0')) == 'v1.1.0', "a release turned back into a draft should be dropped"
+    print("✅ Known releases on the first page refreshed")
+
+
+def test_failed_sync_keeps_index():
+    print("\nTesting that a failed sync leaves the index intact...")
+    feed = FakeReleases([f"0.{minor}.0" for minor in range(150)])
+    index = make_index(feed)
+    index.sync()
+
+    # Enough new releases to need a second page, which then fails
+    for minor in range(150, 260):
+        feed.publish(f"0.{minor}.0")
+    feed.fail_page = 2
+    try:
+        index.sync()
+        assert False, "the failed page should raise"
+    except requests.ConnectionError:
+        pass
+
+    feed.fail_page = None
+    index.sync()
+    assert tag(index.best_update('0.0.0')) == 'v0.259.0'
+    assert tag(index.best_update('0.0.0', pin='0.200')) == 'v0.200.0'
+    print("✅ New releases picked up after the failure")
+
+
+def test_fallback_rules_and_settings():
+    print("\nTesting rules for a single fallback release and settings validation...")
+    latest = {'tag_name': 'v2.0.0', 'assets': []}
+    assert offers(latest, '1.0.0')
+    assert not offers(latest, '1.0.0', pin='1.0')
+    assert not offers(latest, '1.0.0', skipped=['2.0.0'])
+    assert not offers(latest, '2.0.0')
+    beta = {'tag_name': 'v2.1.0b1', 'prerelease': True, 'assets': []}
+    assert not offers(beta, '2.0.0') and offers(beta, '2.0.0', 'beta')
+
+    check_update_settings('beta', '1.2')
+    for channel, pin in (('nightly', None), ('stable', '1.2.x')):
+        try:
+            check_update_settings(channel, pin)
+            assert False, f"{channel!r}/{pin!r} should be rejected"
+        except ValueError:
+            pass
+    print("✅ Fallback releases follow the same rules; bad settings rejected")
+
+
+if __name__ == "__main__":
+    print("🔍 Testing the release index...\n")
+    test_best_update()
+    test_incremental_sync()
+    test_edited_releases_refreshed()
+    test_failed_sync_keeps_index()
+    test_fallback_rules_and_settings()
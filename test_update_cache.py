@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the shared update cache: locking, metadata TTL and LRU eviction
+"""
+
+import os
+import tempfile
+import threading
+import time
+from update_cache import UpdateCache
+
+
+def test_single_download_under_lock():
+    print("Testing that concurrent callers download once...")
+    cache = UpdateCache(tempfile.mkdtemp())
+    downloads = []
+    paths = []
+
+    def download(path):
+        downloads.append(path)
+        time.sleep(0.2)
+        with open(path, 'wb') as f:
+            f.write(b'x' * 1000)
+
+    def worker():
+        # Each worker opens its own lock file descriptor, like a separate process
+        paths.append(cache.get_artifact("http://mirror/a.dmg", download))
+
+    threads = [threading.Thread(target=worker) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(downloads) == 1, f"expected one download, got {len(downloads)}"
+    assert len(set(paths)) == 1 and paths[0].endswith(".dmg")
+    print("✅ One download shared by every caller")
+
+
+def test_metadata_ttl():
+    print("\nTesting metadata reuse and expiry...")
+    cache = UpdateCache(tempfile.mkdtemp(), metadata_ttl=0.3)
+    fetches = []
+
+    def fetch():
+        fetches.append(1)
+        return 200, {'tag_name': f"v1.0.{len(fetches)}"}
+
+    assert cache.get_release(fetch) == (200, {'tag_name': "v1.0.1"})
+    assert cache.get_release(fetch) == (200, {'tag_name': "v1.0.1"})
+    assert len(fetches) == 1, "fresh metadata should not be fetched again"
+
+    time.sleep(0.4)
+    assert cache.get_release(fetch) == (200, {'tag_name': "v1.0.2"})
+    assert len(fetches) == 2, "expired metadata should be fetched again"
+
+    # Failures are not shared
+    cache = UpdateCache(tempfile.mkdtemp())
+    assert cache.get_release(lambda: (404, None)) == (404, None)
+    assert cache.get_release(fetch)[0] == 200
+    print("✅ Metadata is reused until the TTL expires")
+
+
+def test_lru_eviction():
+    print("\nTesting least recently used eviction...")
+    cache = UpdateCache(tempfile.mkdtemp(), max_bytes=2500)
+
+    def writer(byte):
+        def download(path):
+            with open(path, 'wb') as f:
+                f.write(bytes([byte]) * 1000)
+        return download
+
+    first = cache.get_artifact("http://mirror/0.dmg", writer(0))
+    second = cache.get_artifact("http://mirror/1.dmg", writer(1))
+    # Touch the first so the second becomes least recently used
+    os.utime(second, (time.time() - 60, time.time() - 60))
+    cache.get_artifact("http://mirror/0.dmg", writer(0))
+    third = cache.get_artifact("http://mirror/2.dmg", writer(2))
+
+    assert os.path.exists(first) and os.path.exists(third)
+    assert not os.path.exists(second), "least recently used artifact should be evicted"
+    print("✅ Oldest artifact evicted to stay under the size cap")
+
+
+def test_integrity_and_unsafe_dirs():
+    print("\nTesting integrity checks and unsafe cache directories...")
+    cache = UpdateCache(tempfile.mkdtemp())
+
+    def download(path):
+        with open(path, 'wb') as f:
+            f.write(b'tampered')
+
+    try:
+        cache.get_artifact("http://mirror/a.dmg", download, expected_sha256="0" * 64)
+        assert False, "a file with the wrong digest should be rejected"
+    except Exception as e:
+        assert "integrity" in str(e)
+    assert not os.listdir(cache.artifacts_dir), "rejected downloads should not be kept"
+
+    shared = tempfile.mkdtemp()
+    os.chmod(shared, 0o777)
+    link = os.path.join(tempfile.mkdtemp(), "link")
+    os.symlink(tempfile.mkdtemp(), link)
+    for path in (shared, link):
+        try:
+            UpdateCache(path)
+            assert False, f"{path} should be refused"
+        except Exception as e:
+            assert "Update cache" in str(e)
+    print("✅ Bad downloads and unsafe directories are refused")
+
+
+if __name__ == "__main__":
+    print("🔍 Testing the update cache...\n")
+    test_single_download_under_lock()
+    test_metadata_ttl()
+    test_lru_eviction()
+    test_integrity_and_unsafe_dirs()
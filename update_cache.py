@@ -0,0 +1,215 @@
+"""
+Per-user update cache for Beautiful Flower Display
+Lets several app instances run by the same user (e.g. one per display)
+share release metadata and downloaded DMGs instead of each hitting GitHub.
+The cache decides what gets installed into /Applications, so it lives in
+a private directory only its owner can write to.
+
+Layout under the cache directory:
+    metadata.json        latest release data with the time it was fetched
+    releases-index.json  every release sorted by version (see release_index.py)
+    artifacts/<sha256>.* downloaded files, named by their content hash
+    urls/<sha256(url)>   which artifact a download URL resolved to
+    locks/               lock files coordinating processes (fcntl.flock)
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import stat
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+if sys.platform == 'darwin':
+    DEFAULT_CACHE_DIR = os.path.expanduser("~/Library/Caches/Beautiful-Flower-Display")
+else:
+    DEFAULT_CACHE_DIR = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+        "Beautiful-Flower-Display"
+    )
+
+# Shared release metadata is reused for this many seconds
+DEFAULT_METADATA_TTL = 300
+
+# Artifacts are evicted least recently used first above this size
+DEFAULT_MAX_CACHE_BYTES = 512 * 1024 * 1024
+
+
+class UpdateCache:
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, metadata_ttl=DEFAULT_METADATA_TTL,
+                 max_bytes=DEFAULT_MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.metadata_ttl = metadata_ttl
+        self.max_bytes = max_bytes
+        self.metadata_path = os.path.join(cache_dir, "metadata.json")
+        self.artifacts_dir = os.path.join(cache_dir, "artifacts")
+        self.urls_dir = os.path.join(cache_dir, "urls")
+        self.locks_dir = os.path.join(cache_dir, "locks")
+
+        for path in (cache_dir, self.artifacts_dir, self.urls_dir, self.locks_dir):
+            os.makedirs(path, mode=0o700, exist_ok=True)
+            _check_private_dir(path)
+
+    @contextmanager
+    def locked(self, name):
+        """Hold an exclusive lock shared with every process using this cache"""
+        fd = os.open(os.path.join(self.locks_dir, f"{name}.lock"), os.O_RDONLY | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+            os.close(fd)
+
+    def write_atomic(self, path, data):
+        """Write a file so readers never see it half written"""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            os.remove(tmp_path)
+            raise
+
+    def _read_fresh_metadata(self):
+        try:
+            with open(self.metadata_path, 'r') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if time.time() - metadata.get('fetched_at', 0) > self.metadata_ttl:
+            return None
+        return metadata['release_data']
+
+    def get_release(self, fetch):
+        """Get the latest release, calling fetch() only if no process has a fresh copy
+
+        fetch returns (status_code, release_data); only successful results are shared.
+        """
+        release_data = self._read_fresh_metadata()
+        if release_data is not None:
+            return 200, release_data
+
+        with self.locked("metadata"):
+            # Another process may have refreshed it while we waited
+            release_data = self._read_fresh_metadata()
+            if release_data is not None:
+                return 200, release_data
+
+            status_code, release_data = fetch()
+            if status_code == 200:
+                metadata = {'fetched_at': time.time(), 'release_data': release_data}
+                self.write_atomic(self.metadata_path, json.dumps(metadata).encode())
+            return status_code, release_data
+
+    def _lookup_artifact(self, url_key, expected_sha256):
+        """Find a verified artifact previously downloaded for a URL"""
+        try:
+            with open(os.path.join(self.urls_dir, url_key), 'r') as f:
+                artifact_name = f.read().strip()
+        except OSError:
+            return None
+        sha256 = artifact_name.split('.')[0]
+        if expected_sha256 and sha256 != expected_sha256:
+            return None
+
+        artifact_path = os.path.join(self.artifacts_dir, artifact_name)
+        try:
+            if file_sha256(artifact_path) != sha256:
+                return None
+            # Mark as recently used for LRU eviction
+            os.utime(artifact_path)
+        except OSError:
+            return None
+        return artifact_path
+
+    def get_artifact(self, url, download, expected_sha256=None):
+        """Get a local path for a download URL, downloading it at most once per cache
+
+        download(path) writes the file at url to path. Processes asking for the
+        same URL wait for the first one and reuse its verified result.
+        """
+        url_key = hashlib.sha256(url.encode()).hexdigest()
+
+        with self.locked(f"url-{url_key}"):
+            artifact_path = self._lookup_artifact(url_key, expected_sha256)
+            if artifact_path is not None:
+                return artifact_path
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.artifacts_dir, suffix=".partial")
+            os.close(fd)
+            try:
+                download(tmp_path)
+                sha256 = file_sha256(tmp_path)
+                if expected_sha256 and sha256 != expected_sha256:
+                    raise Exception("Downloaded file failed integrity check")
+                # Keep the extension, hdiutil and friends look at it
+                artifact_name = sha256 + os.path.splitext(urlparse(url).path)[1]
+                artifact_path = os.path.join(self.artifacts_dir, artifact_name)
+                os.replace(tmp_path, artifact_path)
+            except Exception:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+
+            self.write_atomic(os.path.join(self.urls_dir, url_key), artifact_name.encode())
+
+        self.evict(keep=artifact_path)
+        return artifact_path
+
+    def evict(self, keep=None):
+        """Remove least recently used artifacts until the cache fits its size cap"""
+        with self.locked("evict"):
+            artifacts = []
+            for name in os.listdir(self.artifacts_dir):
+                path = os.path.join(self.artifacts_dir, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                if name.endswith(".partial"):
+                    # Left behind by a process that died mid-download
+                    if time.time() - stat.st_mtime > 3600:
+                        try:
+                            os.remove(path)
+                        except OSError:
+                            pass
+                    continue
+                artifacts.append((stat.st_mtime, stat.st_size, path))
+
+            total = sum(size for _, size, _ in artifacts)
+            for _, size, path in sorted(artifacts):
+                if total <= self.max_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+
+def _check_private_dir(path):
+    """Refuse a cache directory that anyone but the current user could tamper with"""
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode) or not stat.S_ISDIR(info.st_mode):
+        raise Exception(f"Update cache {path} is not a directory")
+    if info.st_uid != os.getuid():
+        raise Exception(f"Update cache {path} is owned by another user")
+    if info.st_mode & (stat.S_IWGRP | stat.S_IWOTH):
+        raise Exception(f"Update cache {path} is writable by other users")
+
+
+def file_sha256(path):
+    """Hash a file in chunks"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -8,34 +8,61 @@ import tkinter as tk
 from tkinter import messagebox
 import webbrowser
 import threading
-from packaging import version
-from version import __version__, GITHUB_API_URL, DOWNLOAD_URL_TEMPLATE
+from version import __version__, GITHUB_API_URL, DOWNLOAD_URL_TEMPLATE, METADATA_MIRRORS
+from version import UPDATE_CHANNEL, UPDATE_PIN, SKIPPED_VERSIONS
+from update_cache import UpdateCache
+import mirrors
+import release_index
 
 
 class UpdateChecker:
-    def __init__(self, parent_window=None):
+    def __init__(self, parent_window=None, cache=None):
         self.parent_window = parent_window
         self.current_version = __version__
+        # Shared with this user's other instances so only one downloads;
+        # created by the first check so a bad cache dir is reported there
+        self.cache = cache
+    
+    def _fetch_latest_release(self):
+        """Fetch the latest release from the fastest mirror, returns (status_code, release_data)"""
+        return mirrors.fetch_json(METADATA_MIRRORS, timeout=10)
+    
+    def _fetch_release_page(self, page, etag=None):
+        """Fetch one page of the releases list, returns (status_code, releases, etag)"""
+        return release_index.fetch_release_page(page, etag)
+    
+    def _find_update(self):
+        """Best release to offer on the configured channel, or None if up to date"""
+        index = release_index.ReleaseIndex(self.cache, self._fetch_release_page)
+        index.sync()
+        return index.best_update(self.current_version, UPDATE_CHANNEL, SKIPPED_VERSIONS, UPDATE_PIN)
     
     def check_for_updates(self, show_no_update_message=False):
         """Check for updates in a background thread"""
         def _check():
             try:
-                response = requests.get(GITHUB_API_URL, timeout=10)
-                if response.status_code == 200:
-                    release_data = response.json()
-                    latest_version = release_data['tag_name'].lstrip('v')
-                    
-                    if version.parse(latest_version) > version.parse(self.current_version):
-                        self._show_update_dialog(latest_version, release_data)
-                    elif show_no_update_message:
-                        self._show_no_update_message()
-                else:
-                    if show_no_update_message:
-                        error_msg = f"Failed to check for updates (HTTP {response.status_code})"
-                        if response.status_code == 404:
-                            error_msg += "\n\nThis usually means:\n• No releases exist yet\n• Repository is private\n• Repository doesn't exist"
-                        self._show_error_message(error_msg)
+                if self.cache is None:
+                    self.cache = UpdateCache()
+                try:
+                    release_data = self._find_update()
+                except requests.RequestException:
+                    # Releases list unreachable, fall back to the latest release
+                    status_code, release_data = self.cache.get_release(self._fetch_latest_release)
+                    if status_code != 200:
+                        if show_no_update_message:
+                            error_msg = f"Failed to check for updates (HTTP {status_code})"
+                            if status_code == 404:
+                                error_msg += "\n\nThis usually means:\n• No releases exist yet\n• Repository is private\n• Repository doesn't exist"
+                            self._show_error_message(error_msg)
+                        return
+                    if not release_index.offers(release_data, self.current_version,
+                                                UPDATE_CHANNEL, SKIPPED_VERSIONS, UPDATE_PIN):
+                        release_data = None
+                
+                if release_data is not None:
+                    self._show_update_dialog(release_data['tag_name'].lstrip('v'), release_data)
+                elif show_no_update_message:
+                    self._show_no_update_message()
             except Exception as e:
                 if show_no_update_message:
                     self._show_error_message(f"Update check failed: {str(e)}")
@@ -2,6 +2,8 @@
 Version management for Beautiful Flower Display
 """
 
+import os
+
 __version__ = "1.0.2"
 __app_name__ = "Beautiful Flower Display"
 __bundle_id__ = "com.yourcompany.flowerapp"
@@ -11,3 +13,22 @@ GITHUB_REPO_OWNER = "stafne"  # Your GitHub username
 GITHUB_REPO_NAME = "test2_update_app"  # Your actual repo name
 GITHUB_API_URL = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases/latest"
 DOWNLOAD_URL_TEMPLATE = f"https://github.com/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases/download/{{version}}/Beautiful-Flower-Display-{{version}}.dmg"
+
+# Mirrors raced against GitHub for release metadata and DMG downloads.
+# Metadata mirrors are full URLs serving the same JSON as GITHUB_API_URL.
+# Asset mirrors are templates filled with {tag} and {name}, e.g.
+# "http://mirror.local/releases/{tag}/{name}". Both lists can be extended
+# with comma separated URLs in FLOWER_METADATA_MIRRORS / FLOWER_ASSET_MIRRORS.
+METADATA_MIRRORS = [GITHUB_API_URL] + [url for url in os.environ.get("FLOWER_METADATA_MIRRORS", "").split(",") if url]
+ASSET_MIRROR_TEMPLATES = [url for url in os.environ.get("FLOWER_ASSET_MIRRORS", "").split(",") if url]
+
+# Release index used to pick updates by channel. UPDATE_CHANNEL is "stable"
+# or "beta" (stable plus prereleases). UPDATE_PIN keeps updates within a
+# version prefix such as "1.2", and SKIPPED_VERSIONS are never offered.
+GITHUB_RELEASES_URL = f"https://api.github.com/repos/{GITHUB_REPO_OWNER}/{GITHUB_REPO_NAME}/releases"
+# Mirrors of the paginated releases list (answering ?per_page=&page= like GitHub),
+# raced like METADATA_MIRRORS; extend with FLOWER_RELEASES_MIRRORS.
+RELEASES_MIRRORS = [GITHUB_RELEASES_URL] + [url for url in os.environ.get("FLOWER_RELEASES_MIRRORS", "").split(",") if url]
+UPDATE_CHANNEL = os.environ.get("FLOWER_UPDATE_CHANNEL", "stable")
+UPDATE_PIN = os.environ.get("FLOWER_UPDATE_PIN") or None
+SKIPPED_VERSIONS = [v for v in os.environ.get("FLOWER_SKIPPED_VERSIONS", "").split(",") if v]